@@ -21,38 +21,45 @@ import argparse
 import subprocess
 import tempfile
 import shutil
+import multiprocessing
+import itertools
 from datetime import datetime, timedelta
+from functools import cached_property
 from collections import defaultdict, Counter
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Set, Tuple, Optional, Any
 import re
 import urllib.parse
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 import html
 
-@dataclass
+try:
+    import orjson  # Optional: faster JSON reports
+except ImportError:
+    orjson = None
+
+@dataclass(slots=True)
 class BranchInfo:
     name: str
     last_commit_date: str
-    commit_count: int
-    author_count: int
+    commit_count: Optional[int]  # None when unknown, e.g. in a shallow clone
+    author_count: Optional[int]
     is_protected: bool = False
     is_main: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class CommitPattern:
     pattern: str
     count: int
     percentage: float
 
-@dataclass
+@dataclass(slots=True)
 class DeveloperActivity:
     author: str
     commits: int
     branches_created: int
-    avg_commit_size: float
     last_activity: str
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     repository_url: str
     analysis_date: str
@@ -69,16 +76,137 @@ class AnalysisResult:
     commit_patterns: List[CommitPattern]
     developer_activity: List[DeveloperActivity]
 
+# Fields are separated by \x01 so author names and subjects containing '|' stay intact
+HISTORY_FORMAT = "%H%x01%an%x01%ae%x01%s%x01%P%x01%at%x01%ad"
+
+# Commits handed to each worker process when scanning history with --jobs
+HISTORY_CHUNK_SIZE = 5000
+
+# Pipe buffer for streamed git output, large enough that git rarely blocks on us
+GIT_STREAM_BUFSIZE = 1_048_576
+
+# Prefixes are tried first, then the WIP/temporary substrings, mirroring the
+# priority of the original if/elif cascade; the index of the group that matched
+# selects the pattern label, and index 0 is used when nothing matched. Subjects
+# are matched as raw bytes so the log never has to be decoded as a whole
+_COMMIT_PATTERN_RE = re.compile(
+    rb'(feat)|(fix)|(hotfix)|(merge)|(chore)|(docs)|(test)|(refactor)|.*?(wip)|.*?(temp)',
+    re.IGNORECASE | re.DOTALL
+)
+_COMMIT_PATTERN_LABELS = (
+    'other', 'feat:', 'fix:', 'hotfix:', 'merge:', 'chore:', 'docs:', 'test:', 'refactor:', 'WIP', 'temporary'
+)
+CONVENTIONAL_PATTERNS = ('feat:', 'fix:', 'chore:', 'docs:', 'test:', 'refactor:')
+
+def _parse_history(lines):
+    """Yield (sha, author, email, subject, parents, timestamp, date) byte tuples from HISTORY_FORMAT lines"""
+    for line in lines:
+        parts = line.split(b'\x01')
+        if len(parts) == 7:
+            yield tuple(parts)
+
+def _chunked(lines, size: int):
+    """Yield lists of up to size items from an iterator"""
+    while True:
+        chunk = list(itertools.islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+@dataclass(slots=True)
+class _AuthorStats:
+    """Per-author accumulator used while scanning history"""
+    commits: int = 0
+    branches: Set[str] = field(default_factory=set)
+    last_activity: str = ''
+    last_timestamp: int = 0
+
+def _tally_commits(commits) -> Tuple[Counter, Dict[str, _AuthorStats]]:
+    """Accumulate commit pattern counts and per-author stats over parsed commits"""
+    # Counts are kept in a fixed-size list indexed by regex group and only
+    # turned into labelled Counter entries once the chunk is done
+    pattern_counts = [0] * len(_COMMIT_PATTERN_LABELS)
+    match_pattern = _COMMIT_PATTERN_RE.match
+    author_commits = Counter()
+    author_last_activity = {}
+    
+    for _sha, author, _email, subject, parents, timestamp, date in commits:
+        match = match_pattern(subject)
+        pattern_counts[match.lastindex if match else 0] += 1
+        
+        # Merges still count towards the merge pattern, but not towards the
+        # author's own commits; several parents are separated by spaces
+        if b' ' in parents:
+            continue
+        
+        author_commits[author] += 1
+        # Dates carry each author's own offset, so compare on the unix timestamp
+        timestamp = int(timestamp)
+        if author not in author_last_activity or timestamp > author_last_activity[author][0]:
+            author_last_activity[author] = (timestamp, date)
+    
+    # Only the distinct author names and their dates are decoded
+    author_stats = defaultdict(_AuthorStats)
+    for author, commit_count in author_commits.items():
+        stats = author_stats[author.decode('utf-8', errors='replace')]
+        stats.commits += commit_count
+        timestamp, date = author_last_activity[author]
+        if not stats.last_activity or timestamp > stats.last_timestamp:
+            stats.last_timestamp = timestamp
+            stats.last_activity = date.decode('ascii')
+    
+    patterns = Counter({
+        label: count for label, count in zip(_COMMIT_PATTERN_LABELS, pattern_counts) if count
+    })
+    return patterns, author_stats
+
+def _tally_commit_chunk(chunk: Tuple[str, List[bytes]]) -> Tuple[Counter, Dict[str, _AuthorStats]]:
+    """Worker process: read the given commits with one git log --no-walk and tally them"""
+    repo_path, shas = chunk
+    command = ["log", "--no-walk", "--stdin", "--date=iso", f"--format={HISTORY_FORMAT}"]
+    result = subprocess.run(
+        ["git"] + command,
+        cwd=repo_path,
+        input=b'\n'.join(shas) + b'\n',
+        capture_output=True
+    )
+    if result.returncode != 0:
+        print(f"Git command failed: {' '.join(command)}")
+    return _tally_commits(_parse_history(result.stdout.splitlines()))
+
+def _git_version() -> Tuple[int, ...]:
+    """Version of the installed git as a tuple of ints, e.g. (2, 39)"""
+    output = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout
+    match = re.search(r'(\d+)\.(\d+)', output)
+    return tuple(int(part) for part in match.groups()) if match else (0, 0)
+
 class RepositoryAnalyzer:
-    def __init__(self, repo_path: str, detailed: bool = False):
+    def __init__(self, repo_path: str, detailed: bool = False, jobs: int = 1,
+                 since: Optional[str] = None, max_commits: Optional[int] = None, scope: str = "heads",
+                 submodules: bool = False):
         self.repo_path = repo_path
         self.detailed = detailed
+        self.jobs = jobs
+        self.since = since
+        self.max_commits = max_commits
+        self.scope = scope
+        self.submodules = submodules
         self.temp_dir = None
+        self._remote_branches_only = False
+        self._catfile = None
+        self._command_cache: Dict[Tuple[str, ...], str] = {}
         
     def __enter__(self):
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._catfile:
+            try:
+                self._catfile.stdin.close()
+            except OSError:
+                pass  # cat-file already exited; the unflushed buffer has nowhere to go
+            self._catfile.wait()
+            self._catfile = None
         if self.temp_dir and os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
     
@@ -88,129 +216,300 @@ class RepositoryAnalyzer:
         
         try:
             print(f"Cloning repository: {repo_url}")
-            subprocess.run([
-                "git", "clone", "--mirror", repo_url, 
-                os.path.join(self.temp_dir, "repo.git")
-            ], check=True, capture_output=True)
+            if self.submodules:
+                # Submodules can only be checked out into a working copy
+                repo_dir = os.path.join(self.temp_dir, "working")
+                # A working copy also creates a local branch for the checkout that
+                # duplicates its remote-tracking branch, so only the latter are read
+                self._remote_branches_only = True
+                clone_command = ["git", "clone", "--filter=blob:none", "--recurse-submodules"]
+                if _git_version() >= (2, 9):
+                    # Fetch the submodules in parallel rather than one after another
+                    clone_command.append(f"--jobs={os.cpu_count()}")
+            else:
+                # Every analysis step reads history only, so a bare mirror without
+                # blobs is enough and no working copy is checked out
+                repo_dir = os.path.join(self.temp_dir, "repo.git")
+                clone_command = ["git", "clone", "--mirror", "--filter=blob:none"]
             
-            # Create a working copy
-            working_dir = os.path.join(self.temp_dir, "working")
-            subprocess.run([
-                "git", "clone", os.path.join(self.temp_dir, "repo.git"), working_dir
-            ], check=True, capture_output=True)
+            # Only fetch the history inside the analysis horizon
+            if self.since:
+                clone_command.extend([f"--shallow-since={self.since}", "--no-single-branch"])
+            elif self.max_commits:
+                clone_command.extend([f"--depth={self.max_commits}", "--no-single-branch"])
             
-            return working_dir
+            subprocess.run(clone_command + [repo_url, repo_dir], check=True, capture_output=True)
+            
+            return repo_dir
             
         except subprocess.CalledProcessError as e:
-            print(f"Error cloning repository: {e}")
+            stderr = e.stderr.decode('utf-8', errors='replace').strip()
+            if self.since and "no commits selected for shallow requests" in stderr:
+                print(f"Error cloning repository: no commits found since {self.since}")
+            else:
+                print(f"Error cloning repository: {stderr or e}")
             sys.exit(1)
     
-    def get_git_command(self, command: List[str]) -> str:
-        """Execute git command and return output"""
+    def get_git_command(self, command: List[str], quiet: bool = False) -> str:
+        """Execute git command and return output (empty on failure, reported unless quiet), reusing the output of identical earlier calls"""
+        # The repository is read-only during analysis, so output only depends on path and argv
+        cache_key = (self.repo_path, *command)
+        if cache_key in self._command_cache:
+            return self._command_cache[cache_key]
+        
         try:
             result = subprocess.run(
                 ["git"] + command,
                 cwd=self.repo_path,
                 capture_output=True,
-                text=True,
                 check=True
             )
-            return result.stdout.strip()
+            output = result.stdout.decode('utf-8', errors='replace').strip()
         except subprocess.CalledProcessError as e:
+            if not quiet:
+                print(f"Git command failed: {' '.join(command)}")
+            output = ""
+        
+        self._command_cache[cache_key] = output
+        return output
+    
+    def exists(self, rev: str) -> bool:
+        """Check whether a revision resolves to an object, via a persistent cat-file process"""
+        if self._catfile is None:
+            # Started on first use since the repository may only exist after cloning
+            self._catfile = subprocess.Popen(
+                ["git", "-C", self.repo_path, "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+        
+        # cat-file exits straight away when the path is not a repository
+        if self._catfile.poll() is not None:
+            return False
+        
+        try:
+            self._catfile.stdin.write(rev + "\n")
+            self._catfile.stdin.flush()
+            reply = self._catfile.stdout.readline()
+        except OSError:
+            return False
+        
+        # Unresolvable revisions are echoed back as "<rev> missing" or "<rev> ambiguous"
+        return bool(reply) and reply.split()[-1] not in ("missing", "ambiguous")
+    
+    def _iter_git_lines(self, command: List[str], binary: bool = False):
+        """Execute git command and yield its output line by line (as bytes if binary) while it is still running"""
+        process = subprocess.Popen(
+            ["git"] + command,
+            cwd=self.repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding=None if binary else 'utf-8',
+            errors=None if binary else 'replace',
+            bufsize=GIT_STREAM_BUFSIZE
+        )
+        newline = b'\n' if binary else '\n'
+        
+        try:
+            for line in process.stdout:
+                yield line.rstrip(newline)
+        finally:
+            # Also reached when the consumer stops early; git then exits on the closed pipe
+            process.stdout.close()
+            returncode = process.wait()
+        
+        if returncode != 0:
             print(f"Git command failed: {' '.join(command)}")
-            return ""
     
-    def analyze_branches(self) -> Tuple[List[BranchInfo], str]:
+    @cached_property
+    def main_branch(self) -> str:
+        """Name of the main branch, detected once per analyzer"""
+        # The default branch is recorded as a symbolic ref: HEAD in a bare mirror,
+        # origin/HEAD in a regular clone
+        if self.get_git_command(["rev-parse", "--is-bare-repository"]) == "true":
+            default_ref = "HEAD"
+        else:
+            default_ref = "refs/remotes/origin/HEAD"
+        
+        # Empty when the ref is missing or not symbolic, e.g. a detached HEAD
+        default_branch = self.get_git_command(["symbolic-ref", "-q", "--short", default_ref], quiet=True).removeprefix("origin/")
+        if default_branch and self.exists(default_branch):
+            return default_branch
+        
+        main_candidates = ["main", "master", "trunk", "develop"]
+        for candidate in main_candidates:
+            if self.exists(candidate):
+                return candidate
+        
+        return "main"  # Default
+    
+    def analyze_branches(self) -> List[BranchInfo]:
         """Analyze branch structure and patterns"""
         print("Analyzing branch structure...")
         
-        # Get all branches
-        branches_output = self.get_git_command(["branch", "-a", "--format=%(refname:short)|%(committerdate:iso)|%(authorname)"])
+        # Get all local and remote branches
+        branches_output = self._iter_git_lines([
+            "for-each-ref",
+            "--format=%(refname:short)%01%(committerdate:iso)%01%(authorname)%01%(symref)%01%(refname)%01%(objectname)",
+            *self._branch_namespaces()
+        ])
         
         branch_info = []
-        main_branch = "main"  # Default
+        main_branch = self.main_branch
         
-        # Try to detect main branch
-        main_candidates = ["main", "master", "trunk", "develop"]
-        for candidate in main_candidates:
-            if self.get_git_command(["rev-parse", "--verify", candidate]):
-                main_branch = candidate
-                break
-        
-        for line in branches_output.split('\n'):
-            if not line or 'HEAD' in line:
+        branch_refs = []
+        for line in branches_output:
+            if not line:
                 continue
                 
-            parts = line.split('|')
-            if len(parts) >= 3:
-                branch_name = parts[0].replace('origin/', '')
-                commit_date = parts[1]
-                author = parts[2]
-                
-                # Get commit count for this branch
-                commit_count = len(self.get_git_command([
-                    "rev-list", "--count", f"{main_branch}..{branch_name}"
-                ]).split('\n'))
-                
-                # Get unique authors for this branch
-                authors_output = self.get_git_command([
-                    "log", f"{main_branch}..{branch_name}", "--format=%an"
-                ])
-                author_count = len(set(authors_output.split('\n'))) if authors_output else 0
-                
-                branch_info.append(BranchInfo(
-                    name=branch_name,
-                    last_commit_date=commit_date,
-                    commit_count=commit_count,
-                    author_count=author_count,
-                    is_main=(branch_name == main_branch)
-                ))
-        
-        return branch_info, main_branch
-    
-    def analyze_commit_patterns(self) -> List[CommitPattern]:
-        """Analyze commit message patterns"""
-        print("Analyzing commit patterns...")
-        
-        # Get commit messages
-        commits_output = self.get_git_command([
-            "log", "--oneline", "--format=%s"
-        ])
+            parts = line.split('\x01')
+            # Symbolic refs such as origin/HEAD only point at another branch
+            if len(parts) < 6 or parts[3]:
+                continue
+            branch_refs.append(parts)
         
-        patterns = defaultdict(int)
-        total_commits = 0
+        # Commit and author counts for every branch tip come from one log walk
+        branch_stats = self._collect_branch_stats({parts[5] for parts in branch_refs})
+        local_tips = {parts[0]: parts[5] for parts in branch_refs if parts[4].startswith('refs/heads/')}
         
-        for commit_msg in commits_output.split('\n'):
-            if not commit_msg:
+        for ref, commit_date, author, _, refname, tip in branch_refs:
+            branch_name = ref.replace('origin/', '')
+            # A remote-tracking branch at the same commit as the local branch is the same branch
+            if refname.startswith('refs/remotes/') and local_tips.get(branch_name) == tip:
+                continue
+            if branch_stats is None:
+                commit_count = author_count = None
+            elif tip in branch_stats:
+                commit_count = branch_stats[tip]['count']
+                author_count = len(branch_stats[tip]['authors'])
+            else:
+                commit_count = author_count = 0
+            
+            branch_info.append(BranchInfo(
+                name=branch_name,
+                last_commit_date=commit_date,
+                commit_count=commit_count,
+                author_count=author_count,
+                is_main=(branch_name == main_branch)
+            ))
+        
+        return branch_info
+    
+    def _branch_namespaces(self) -> List[str]:
+        """Ref namespaces that hold the repository's branches"""
+        if self._remote_branches_only:
+            return ["refs/remotes"]
+        return ["refs/heads", "refs/remotes"]
+    
+    def _collect_branch_stats(self, tips: Set[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Count commits and authors ahead of the main branch for every branch tip from one git log, or None if unknown"""
+        # One walk lists each commit that is on some branch but not on main, with
+        # its parents; following parents from a tip within that set then gives the
+        # tip's own commits, so a commit shared by several branches (a local branch
+        # and its remote-tracking copy, or stacked branches) counts for all of them
+        command = ["log", "--format=%H%x01%P%x01%an"]
+        
+        # Below a shallow boundary '^main' cannot tell that old commits were merged,
+        # so only count commits inside the horizon, or nothing if it is unknown
+        if self.since:
+            command.append(f"--since={self.since}")
+        elif self.get_git_command(["rev-parse", "--is-shallow-repository"]) == "true":
+            print("Shallow clone: commit counts ahead of the main branch are not available")
+            return None
+        
+        parents = {}
+        authors = {}
+        for line in self._iter_git_lines(command + [f"^{self.main_branch}", "--branches", "--remotes", "--"]):
+            if not line:
                 continue
-                
-            total_commits += 1
             
-            # Extract common patterns
-            msg_lower = commit_msg.lower()
+            sha, parent_list, author = line.split('\x01', 2)
+            parents[sha] = parent_list.split()
+            authors[sha] = author
+        
+        branch_stats = {}
+        for tip in tips:
+            reachable = set()
+            pending = [tip] if tip in parents else []
+            while pending:
+                sha = pending.pop()
+                if sha in reachable:
+                    continue
+                reachable.add(sha)
+                pending.extend(parent for parent in parents[sha] if parent in parents)
             
-            if msg_lower.startswith('feat'):
-                patterns['feat:'] += 1
-            elif msg_lower.startswith('fix'):
-                patterns['fix:'] += 1
-            elif msg_lower.startswith('hotfix'):
-                patterns['hotfix:'] += 1
-            elif msg_lower.startswith('merge'):
-                patterns['merge:'] += 1
-            elif msg_lower.startswith('chore'):
-                patterns['chore:'] += 1
-            elif msg_lower.startswith('docs'):
-                patterns['docs:'] += 1
-            elif msg_lower.startswith('test'):
-                patterns['test:'] += 1
-            elif msg_lower.startswith('refactor'):
-                patterns['refactor:'] += 1
-            elif 'wip' in msg_lower:
-                patterns['WIP'] += 1
-            elif 'temp' in msg_lower or 'temporary' in msg_lower:
-                patterns['temporary'] += 1
-            else:
-                patterns['other'] += 1
+            branch_stats[tip] = {'count': len(reachable), 'authors': {authors[sha] for sha in reachable}}
+        
+        return branch_stats
+    
+    def _history_refs(self) -> List[str]:
+        """Refs whose history is scanned for commit patterns and developer activity"""
+        if self.scope == "main":
+            return [self.main_branch]
+        if self.scope == "all":
+            return ["--all"]
+        # Local and remote branches, leaving out tags, stashes and other refs
+        return ["--branches", "--remotes"]
+    
+    def _history_limits(self) -> List[str]:
+        """Revision-walk options restricting the history scan to the analysis horizon"""
+        limits = []
+        if self.since:
+            limits.append(f"--since={self.since}")
+        if self.max_commits:
+            limits.append(f"--max-count={self.max_commits}")
+        return limits
+    
+    def _stream_all_commits(self):
+        """Yield (sha, author, email, subject, parents, timestamp, date) byte tuples for every commit in scope from a single git log"""
+        return _parse_history(self._iter_git_lines(
+            ["log", "--date=iso", f"--format={HISTORY_FORMAT}"] + self._history_limits() + self._history_refs() + ["--"],
+            binary=True
+        ))
+    
+    def analyze_history(self) -> Tuple[List[CommitPattern], Tuple[int, int, int, int], List[DeveloperActivity]]:
+        """Analyze commit patterns and developer activity in one pass over the log"""
+        print("Analyzing commit history...")
+        
+        if self.jobs > 1:
+            patterns, author_stats = self._tally_history_parallel()
+        else:
+            patterns, author_stats = _tally_commits(self._stream_all_commits())
+        
+        commit_patterns, commit_stats = self.analyze_commit_patterns(patterns)
+        return commit_patterns, commit_stats, self.analyze_developer_activity(author_stats)
+    
+    def _tally_history_parallel(self) -> Tuple[Counter, Dict[str, _AuthorStats]]:
+        """Split the commit list into chunks, tally them in worker processes and merge the results"""
+        shas = self._iter_git_lines(["rev-list"] + self._history_limits() + self._history_refs() + ["--"], binary=True)
+        # Chunks are handed to workers while rev-list is still walking the graph
+        chunks = ((self.repo_path, chunk) for chunk in _chunked(shas, HISTORY_CHUNK_SIZE))
+        
+        patterns = Counter()
+        author_stats = defaultdict(_AuthorStats)
+        with multiprocessing.Pool(processes=self.jobs) as pool:
+            for chunk_patterns, chunk_authors in pool.imap_unordered(_tally_commit_chunk, chunks):
+                patterns.update(chunk_patterns)
+                for author, chunk_stats in chunk_authors.items():
+                    stats = author_stats[author]
+                    stats.commits += chunk_stats.commits
+                    if not stats.last_activity or chunk_stats.last_timestamp > stats.last_timestamp:
+                        stats.last_timestamp = chunk_stats.last_timestamp
+                        stats.last_activity = chunk_stats.last_activity
+        
+        return patterns, author_stats
+    
+    def analyze_commit_patterns(self, patterns: Counter) -> Tuple[List[CommitPattern], Tuple[int, int, int, int]]:
+        """Build commit pattern statistics and (total, merge, hotfix, conventional) commit counts"""
+        total_commits = sum(patterns.values())
+        commit_stats = (
+            total_commits,
+            patterns['merge:'],
+            patterns['hotfix:'],
+            sum(patterns[pattern] for pattern in CONVENTIONAL_PATTERNS)
+        )
         
         commit_patterns = []
         for pattern, count in patterns.items():
@@ -220,75 +519,59 @@ class RepositoryAnalyzer:
                 percentage=(count / total_commits * 100) if total_commits > 0 else 0
             ))
         
-        return sorted(commit_patterns, key=lambda x: x.count, reverse=True)
+        return sorted(commit_patterns, key=lambda x: x.count, reverse=True), commit_stats
     
-    def analyze_developer_activity(self) -> List[DeveloperActivity]:
-        """Analyze developer activity patterns"""
-        print("Analyzing developer activity...")
-        
-        # Get author statistics
-        authors_output = self.get_git_command([
-            "log", "--format=%an|%ae", "--all"
-        ])
-        
-        author_stats = defaultdict(lambda: {
-            'commits': 0,
-            'branches': set(),
-            'commit_sizes': [],
-            'last_activity': ''
-        })
-        
-        for line in authors_output.split('\n'):
-            if not line:
-                continue
-                
-            parts = line.split('|')
-            if len(parts) >= 2:
-                author = parts[0]
-                author_stats[author]['commits'] += 1
-        
+    def analyze_developer_activity(self, author_stats: Dict[str, _AuthorStats]) -> List[DeveloperActivity]:
+        """Build developer activity statistics from per-author commit stats"""
         # Get branch creation info
-        branches_output = self.get_git_command([
-            "for-each-ref", "--format=%(refname:short)|%(authorname)", "refs/heads"
+        branches_output = self._iter_git_lines([
+            "for-each-ref", "--format=%(refname:short)%01%(authorname)%01%(symref)",
+            "refs/remotes" if self._remote_branches_only else "refs/heads"
         ])
         
-        for line in branches_output.split('\n'):
+        for line in branches_output:
             if not line:
                 continue
                 
-            parts = line.split('|')
-            if len(parts) >= 2:
+            parts = line.split('\x01')
+            if len(parts) >= 3 and not parts[2]:
                 branch_name = parts[0]
                 author = parts[1]
-                author_stats[author]['branches'].add(branch_name)
-        
-        # Get last activity dates
-        last_activity_output = self.get_git_command([
-            "log", "--format=%an|%ad", "--date=iso", "--all", "-1"
-        ])
-        
-        if last_activity_output:
-            parts = last_activity_output.split('|')
-            if len(parts) >= 2:
-                author = parts[0]
-                last_date = parts[1]
-                author_stats[author]['last_activity'] = last_date
+                author_stats[author].branches.add(branch_name)
         
         developer_activity = []
         for author, stats in author_stats.items():
-            avg_commit_size = sum(stats['commit_sizes']) / len(stats['commit_sizes']) if stats['commit_sizes'] else 0
-            
             developer_activity.append(DeveloperActivity(
                 author=author,
-                commits=stats['commits'],
-                branches_created=len(stats['branches']),
-                avg_commit_size=avg_commit_size,
-                last_activity=stats['last_activity']
+                commits=stats.commits,
+                branches_created=len(stats.branches),
+                last_activity=stats.last_activity
             ))
         
         return sorted(developer_activity, key=lambda x: x.commits, reverse=True)
     
-    def calculate_metrics(self, branch_info: List[BranchInfo], commit_patterns: List[CommitPattern]) -> Tuple[float, float, float, float]:
+    def _existing_paths(self, paths: List[str]) -> Set[str]:
+        """Return which of the given repository-relative paths exist, listing each directory once"""
+        if self.get_git_command(["rev-parse", "--is-bare-repository"]) == "true":
+            # No worktree to look at, so check the tree of HEAD instead
+            return set(self.get_git_command(["ls-tree", "--name-only", "HEAD", "--"] + paths).split('\n'))
+        
+        listings = {}
+        existing = set()
+        for path in paths:
+            directory, _, name = path.rpartition('/')
+            if directory not in listings:
+                try:
+                    with os.scandir(os.path.join(self.repo_path, directory)) as entries:
+                        listings[directory] = {entry.name for entry in entries}
+                except OSError:
+                    listings[directory] = set()
+            if name in listings[directory]:
+                existing.add(path)
+        
+        return existing
+    
+    def calculate_metrics(self, branch_info: List[BranchInfo], commit_stats: Tuple[int, int, int, int]) -> Tuple[float, float, float, float]:
         """Calculate key metrics"""
         print("Calculating metrics...")
         
@@ -296,13 +579,12 @@ class RepositoryAnalyzer:
         total_branches = len([b for b in branch_info if not b.is_main])
         branch_lifespan_avg = 0.0  # Would need more complex analysis
         
+        total_commits, merge_commits, hotfix_commits, _ = commit_stats
+        
         # Merge frequency
-        merge_commits = sum(p.count for p in commit_patterns if 'merge' in p.pattern.lower())
-        total_commits = sum(p.count for p in commit_patterns)
         merge_frequency = (merge_commits / total_commits * 100) if total_commits > 0 else 0
         
         # Hotfix frequency
-        hotfix_commits = sum(p.count for p in commit_patterns if 'hotfix' in p.pattern.lower())
         hotfix_frequency = (hotfix_commits / total_commits * 100) if total_commits > 0 else 0
         
         # CI/CD Score (based on file presence)
@@ -315,22 +597,26 @@ class RepositoryAnalyzer:
             '.travis.yml'
         ]
         
+        existing_files = self._existing_paths(ci_cd_files)
+        
         ci_cd_score = 0
         for file_path in ci_cd_files:
-            if os.path.exists(os.path.join(self.repo_path, file_path)):
+            if file_path in existing_files:
                 ci_cd_score += 20
         
         # Trunk-based development score
         trunk_based_score = 0
         
-        # Factor 1: Number of long-lived branches (lower is better)
-        long_lived_branches = len([b for b in branch_info if b.commit_count > 10])
-        if long_lived_branches <= 2:
-            trunk_based_score += 30
-        elif long_lived_branches <= 5:
-            trunk_based_score += 20
-        elif long_lived_branches <= 10:
-            trunk_based_score += 10
+        # Factor 1: Number of long-lived branches (lower is better), left out
+        # when the branch commit counts are unknown
+        if all(b.commit_count is not None for b in branch_info):
+            long_lived_branches = len([b for b in branch_info if b.commit_count > 10])
+            if long_lived_branches <= 2:
+                trunk_based_score += 30
+            elif long_lived_branches <= 5:
+                trunk_based_score += 20
+            elif long_lived_branches <= 10:
+                trunk_based_score += 10
         
         # Factor 2: Merge frequency (higher is better for trunk-based)
         if merge_frequency > 20:
@@ -355,7 +641,7 @@ class RepositoryAnalyzer:
         
         return branch_lifespan_avg, merge_frequency, hotfix_frequency, ci_cd_score, trunk_based_score
     
-    def generate_recommendations(self, branch_info: List[BranchInfo], commit_patterns: List[CommitPattern], 
+    def generate_recommendations(self, branch_info: List[BranchInfo], commit_stats: Tuple[int, int, int, int], 
                                ci_cd_score: float, trunk_based_score: float) -> List[str]:
         """Generate recommendations for improvement"""
         recommendations = []
@@ -373,14 +659,13 @@ class RepositoryAnalyzer:
             recommendations.append("🔒 Implement branch protection: Require PR reviews and status checks")
         
         # Commit message recommendations
-        conventional_commits = sum(p.count for p in commit_patterns if p.pattern in ['feat:', 'fix:', 'chore:', 'docs:', 'test:', 'refactor:'])
-        total_commits = sum(p.count for p in commit_patterns)
+        total_commits, _, _, conventional_commits = commit_stats
         
-        if conventional_commits / total_commits < 0.7:
+        if total_commits > 0 and conventional_commits / total_commits < 0.7:
             recommendations.append("📋 Adopt conventional commit messages: Use feat:, fix:, chore:, docs:, test:, refactor: prefixes")
         
         # Branch management recommendations
-        long_lived_branches = [b for b in branch_info if b.commit_count > 20 and not b.is_main]
+        long_lived_branches = [b for b in branch_info if b.commit_count is not None and b.commit_count > 20 and not b.is_main]
         if len(long_lived_branches) > 3:
             recommendations.append("🌿 Clean up long-lived branches: Merge or delete branches with >20 commits")
         
@@ -396,27 +681,28 @@ class RepositoryAnalyzer:
         print(f"Starting analysis of repository: {repo_url}")
         
         # Clone repository if needed
-        if not os.path.exists(self.repo_path):
+        if not self.repo_path or not os.path.exists(self.repo_path):
             self.repo_path = self.clone_repository(repo_url)
+        elif self.submodules:
+            print("Note: --submodules only applies when cloning; analyzing the local repository as is")
         
         # Perform analysis
-        branch_info, main_branch = self.analyze_branches()
-        commit_patterns = self.analyze_commit_patterns()
-        developer_activity = self.analyze_developer_activity()
+        branch_info = self.analyze_branches()
+        commit_patterns, commit_stats, developer_activity = self.analyze_history()
         
         # Calculate metrics
-        branch_lifespan_avg, merge_frequency, hotfix_frequency, ci_cd_score, trunk_based_score = self.calculate_metrics(branch_info, commit_patterns)
+        branch_lifespan_avg, merge_frequency, hotfix_frequency, ci_cd_score, trunk_based_score = self.calculate_metrics(branch_info, commit_stats)
         
         # Generate recommendations
-        recommendations = self.generate_recommendations(branch_info, commit_patterns, ci_cd_score, trunk_based_score)
+        recommendations = self.generate_recommendations(branch_info, commit_stats, ci_cd_score, trunk_based_score)
         
         # Create result
         result = AnalysisResult(
             repository_url=repo_url,
             analysis_date=datetime.now().isoformat(),
-            total_commits=sum(p.count for p in commit_patterns),
+            total_commits=commit_stats[0],
             total_branches=len(branch_info),
-            main_branch=main_branch,
+            main_branch=self.main_branch,
             branch_lifespan_avg=branch_lifespan_avg,
             merge_frequency=merge_frequency,
             hotfix_frequency=hotfix_frequency,
@@ -430,6 +716,36 @@ class RepositoryAnalyzer:
         
         return result
 
+# Per-row templates for the report tables, joined once per table
+RECOMMENDATION_ITEM_HTML = "<li>{recommendation}</li>"
+
+BRANCH_ROW_HTML = """
+        <tr>
+            <td>{name}</td>
+            <td>{commit_count}</td>
+            <td>{author_count}</td>
+            <td>{last_commit_date}</td>
+            <td>{branch_type}</td>
+        </tr>
+        """
+
+COMMIT_PATTERN_ROW_HTML = """
+        <tr>
+            <td>{pattern}</td>
+            <td>{count}</td>
+            <td>{percentage:.1f}%</td>
+        </tr>
+        """
+
+DEVELOPER_ROW_HTML = """
+        <tr>
+            <td>{author}</td>
+            <td>{commits}</td>
+            <td>{branches_created}</td>
+            <td>{last_activity}</td>
+        </tr>
+        """
+
 def generate_html_report(result: AnalysisResult) -> str:
     """Generate HTML report"""
     html_template = """
@@ -440,19 +756,19 @@ def generate_html_report(result: AnalysisResult) -> str:
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Repository Analysis Report</title>
         <style>
-            body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
-            .header { background: #f4f4f4; padding: 20px; border-radius: 8px; margin-bottom: 30px; }
-            .metric { background: #e8f4fd; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 4px solid #2196F3; }
-            .score { font-size: 24px; font-weight: bold; color: #2196F3; }
-            .recommendations { background: #fff3cd; padding: 20px; border-radius: 5px; border-left: 4px solid #ffc107; }
-            .recommendations ul { margin: 10px 0; }
-            .recommendations li { margin: 8px 0; }
-            table { width: 100%; border-collapse: collapse; margin: 20px 0; }
-            th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
-            th { background-color: #f2f2f2; }
-            .good { color: #28a745; }
-            .warning { color: #ffc107; }
-            .danger { color: #dc3545; }
+            body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
+            .header {{ background: #f4f4f4; padding: 20px; border-radius: 8px; margin-bottom: 30px; }}
+            .metric {{ background: #e8f4fd; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 4px solid #2196F3; }}
+            .score {{ font-size: 24px; font-weight: bold; color: #2196F3; }}
+            .recommendations {{ background: #fff3cd; padding: 20px; border-radius: 5px; border-left: 4px solid #ffc107; }}
+            .recommendations ul {{ margin: 10px 0; }}
+            .recommendations li {{ margin: 8px 0; }}
+            table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+            th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
+            th {{ background-color: #f2f2f2; }}
+            .good {{ color: #28a745; }}
+            .warning {{ color: #ffc107; }}
+            .danger {{ color: #dc3545; }}
         </style>
     </head>
     <body>
@@ -586,43 +902,42 @@ def generate_html_report(result: AnalysisResult) -> str:
     """
     
     # Generate HTML content
-    recommendations_html = ""
-    for rec in result.recommendations:
-        recommendations_html += f"<li>{html.escape(rec)}</li>"
+    recommendations_html = ''.join(
+        RECOMMENDATION_ITEM_HTML.format(recommendation=html.escape(rec))
+        for rec in result.recommendations
+    )
     
-    branches_html = ""
+    branch_rows = []
     for branch in result.branch_info[:20]:  # Limit to top 20 branches
-        branch_type = "Main" if branch.is_main else "Feature" if branch.name.startswith(('feature/', 'feat/')) else "Other"
-        branches_html += f"""
-        <tr>
-            <td>{html.escape(branch.name)}</td>
-            <td>{branch.commit_count}</td>
-            <td>{branch.author_count}</td>
-            <td>{branch.last_commit_date}</td>
-            <td>{branch_type}</td>
-        </tr>
-        """
+        name = branch.name
+        branch_type = "Main" if branch.is_main else "Feature" if name.startswith(('feature/', 'feat/')) else "Other"
+        branch_rows.append(BRANCH_ROW_HTML.format(
+            name=html.escape(name),
+            commit_count=branch.commit_count if branch.commit_count is not None else "n/a",
+            author_count=branch.author_count if branch.author_count is not None else "n/a",
+            last_commit_date=branch.last_commit_date,
+            branch_type=branch_type
+        ))
+    branches_html = ''.join(branch_rows)
     
-    commit_patterns_html = ""
-    for pattern in result.commit_patterns:
-        commit_patterns_html += f"""
-        <tr>
-            <td>{html.escape(pattern.pattern)}</td>
-            <td>{pattern.count}</td>
-            <td>{pattern.percentage:.1f}%</td>
-        </tr>
-        """
+    commit_patterns_html = ''.join(
+        COMMIT_PATTERN_ROW_HTML.format(
+            pattern=html.escape(pattern.pattern),
+            count=pattern.count,
+            percentage=pattern.percentage
+        )
+        for pattern in result.commit_patterns
+    )
     
-    developer_activity_html = ""
-    for dev in result.developer_activity[:10]:  # Limit to top 10 developers
-        developer_activity_html += f"""
-        <tr>
-            <td>{html.escape(dev.author)}</td>
-            <td>{dev.commits}</td>
-            <td>{dev.branches_created}</td>
-            <td>{dev.last_activity}</td>
-        </tr>
-        """
+    developer_activity_html = ''.join(
+        DEVELOPER_ROW_HTML.format(
+            author=html.escape(dev.author),
+            commits=dev.commits,
+            branches_created=dev.branches_created,
+            last_activity=dev.last_activity
+        )
+        for dev in result.developer_activity[:10]  # Limit to top 10 developers
+    )
     
     return html_template.format(
         repository_url=html.escape(result.repository_url),
@@ -640,6 +955,17 @@ def generate_html_report(result: AnalysisResult) -> str:
         developer_activity_html=developer_activity_html
     )
 
+def _dataclass_to_dict(obj: Any) -> Dict[str, Any]:
+    """JSON encoder hook: shallow dict of a dataclass, nested values are encoded in turn"""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+def generate_json_report(result: AnalysisResult) -> str:
+    """Generate JSON report"""
+    # Unlike asdict(), the default hook does not deep-copy the result tree first
+    if orjson is not None:
+        return orjson.dumps(result, default=_dataclass_to_dict, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(result, default=_dataclass_to_dict, indent=2)
+
 def main():
     parser = argparse.ArgumentParser(description="Analyze Git repository for trunk-based development and CI/CD implementation")
     parser.add_argument("repository", help="Repository URL or local path")
@@ -647,6 +973,13 @@ def main():
     parser.add_argument("--format", "-f", choices=["html", "json"], default="html", help="Output format")
     parser.add_argument("--detailed", "-d", action="store_true", help="Include detailed analysis")
     parser.add_argument("--suggestions", "-s", action="store_true", help="Include implementation suggestions")
+    parser.add_argument("--since", help="Only analyze commits newer than this date (e.g. 2024-01-01, '6 months ago')")
+    parser.add_argument("--max-commits", type=int, help="Only analyze the most recent N commits")
+    parser.add_argument("--scope", choices=["main", "heads", "all"], default="heads",
+                        help="Refs whose history is analyzed: the main branch, all branches, or every ref including tags")
+    parser.add_argument("--submodules", action="store_true",
+                        help="Clone into a working copy and initialize submodules in parallel (ignored for local paths)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for scanning commit history (0 = all cores)")
     
     args = parser.parse_args()
     
@@ -659,7 +992,9 @@ def main():
         repo_url = args.repository
     
     # Perform analysis
-    with RepositoryAnalyzer(repo_path, args.detailed) as analyzer:
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count()
+    with RepositoryAnalyzer(repo_path, args.detailed, jobs, args.since, args.max_commits, args.scope,
+                          args.submodules) as analyzer:
         result = analyzer.analyze(repo_url)
     
     # Generate output
@@ -667,7 +1002,7 @@ def main():
         output_content = generate_html_report(result)
         output_file = args.output or "analysis_report.html"
     else:  # JSON
-        output_content = json.dumps(asdict(result), indent=2)
+        output_content = generate_json_report(result)
         output_file = args.output or "analysis_report.json"
     
     # Write output